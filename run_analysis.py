@@ -10,11 +10,16 @@ Launcher script that runs the entire trade analysis pipeline:
 
 import os
 import sys
-import subprocess
-import time
+import webbrowser
+from pathlib import Path
 
 def main():
     """Run the complete analysis pipeline"""
+    # Flush progress line by line even when output is piped or redirected;
+    # replaced streams (IDE consoles, captured output) may not support this
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=True)
+
     print("============================================================")
     print("Colombia Trade Analysis: Trump and 2025 Universal Tariffs")
     print("============================================================")
@@ -29,30 +34,37 @@ def main():
     # Get the base directory
     base_dir = os.path.dirname(os.path.abspath(__file__))
     
+    # Run the pipeline scripts in this interpreter instead of spawning new ones
+    sys.path.insert(0, os.path.join(base_dir, 'scripts'))
+    
     # Step 1: Fetch/generate trade data
     print("\n[Step 1] Fetching trade data (through May 2025)...")
-    fetch_script = os.path.join(base_dir, 'scripts', 'fetch_trade_data.py')
-    result = subprocess.run([sys.executable, fetch_script], capture_output=True, text=True)
+    try:
+        import fetch_trade_data
+        rc = fetch_trade_data.main([])
+    except Exception as e:
+        print(f"Error fetching trade data: {e}")
+        return 1
     
-    if result.returncode != 0:
-        print("Error fetching trade data:")
-        print(result.stderr)
+    if rc != 0:
+        print("Error fetching trade data.")
         return 1
     
-    print(result.stdout)
     print("✓ Trade data fetched successfully")
     
     # Step 2: Run analysis and generate report
     print("\n[Step 2] Analyzing trade patterns across all tariff periods...")
-    analyze_script = os.path.join(base_dir, 'scripts', 'analyze_trade_data.py')
-    result = subprocess.run([sys.executable, analyze_script], capture_output=True, text=True)
+    try:
+        import analyze_trade_data
+        rc = analyze_trade_data.main()
+    except Exception as e:
+        print(f"Error during analysis: {e}")
+        return 1
     
-    if result.returncode != 0:
-        print("Error during analysis:")
-        print(result.stderr)
+    if rc != 0:
+        print("Error during analysis.")
         return 1
     
-    print(result.stdout)
     print("✓ Analysis completed successfully")
     
     # Step 3: Display results location
@@ -68,17 +80,10 @@ def main():
         
         # Try to open the report in the default browser
         print("\nAttempting to open the report in your default browser...")
-        try:
-            if sys.platform == 'darwin':  # macOS
-                subprocess.run(['open', report_path])
-            elif sys.platform == 'win32':  # Windows
-                os.startfile(report_path)
-            elif sys.platform == 'linux':  # Linux
-                subprocess.run(['xdg-open', report_path])
-            
+        if webbrowser.open(Path(report_path).as_uri()):
             print("Report opened in browser.")
-        except Exception as e:
-            print(f"Could not open automatically: {e}")
+        else:
+            print("Could not open automatically: no browser available.")
             print(f"Please open {report_path} manually.")
     else:
         print("Report file not found. Check for errors in the analysis step.")
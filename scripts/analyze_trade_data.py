@@ -8,8 +8,11 @@ and the new 2025 Universal U.S. Reciprocal Tariff
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Figures are only saved to files, so skip GUI backend setup
 import matplotlib.pyplot as plt
 import seaborn as sns
 import matplotlib.dates as mdates
@@ -20,6 +23,15 @@ from datetime import datetime
 sns.set_theme()
 sns.set_palette("colorblind")
 
+# Save every figure tightly cropped at screen resolution and simplify long line paths while rendering
+plt.rcParams.update({
+    'savefig.dpi': 150,
+    'savefig.bbox': 'tight',
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+})
+
 # Define time periods (same as in fetch_trade_data.py)
 PRE_TARIFF_START = '2016-01-01'
 TARIFF_START = '2018-03-01'
@@ -31,24 +43,171 @@ NEW_2025_TARIFF_START_APPROX = '2025-04-05'  # Start of Universal 10% Reciprocal
 NEW_2025_TARIFF_END_ONGOING = '2025-05-13'  # For analysis purposes, using the US-China agreement date
 MOST_RECENT_DATA_CONTEXT_2025 = '2025-05-13'  # Reflecting the start of the US-China 90-day agreement
 
+# Tariff dates as Timestamps, parsed once at import
+TARIFF_START_TS = pd.Timestamp(TARIFF_START)
+TARIFF_END_TS = pd.Timestamp(TARIFF_END)
+NEW_2025_TARIFF_START_TS = pd.Timestamp(NEW_2025_TARIFF_START_APPROX)
+NEW_2025_TARIFF_END_TS = pd.Timestamp(NEW_2025_TARIFF_END_ONGOING)
+
+# Tariff events marked on time series plots: (date, line color, legend label)
+TARIFF_LINES = [
+    (TARIFF_START_TS, 'r', 'Trump Tariffs Begin'),
+    (TARIFF_END_TS, 'g', 'Trump Tariffs End'),
+    (NEW_2025_TARIFF_START_TS, 'purple', '2025 Universal Tariff'),
+    (NEW_2025_TARIFF_END_TS, 'orange', 'US-China Agreement'),
+]
+
+# Tariff periods in chronological order
+PERIOD_ORDER = ['pre-tariff', 'during-tariff', 'post-tariff', 'new-2025-tariff', 'post-new-2025-tariff']
+
+# Line plots are downsampled to at most this many points before drawing
+MAX_PLOT_POINTS = 2000
+
+# Worker processes for drawing the independent figure sets in parallel, and the row count from
+# which that beats drawing them one after another (LTTB keeps per-figure cost nearly flat below it)
+PLOT_WORKERS = 3
+PARALLEL_PLOT_MIN_ROWS = 1_000_000
+
+# Trade flow columns in the data
+TRADE_COLS = ['colombia_us_exports', 'colombia_us_imports', 'colombia_china_exports', 'colombia_china_imports']
+
 # Create output directories if they don't exist
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
+CACHE_DIR = os.path.join(DATA_DIR, '.cache')
 RESULTS_DIR = os.path.join(BASE_DIR, 'results')
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
 def load_data():
-    """Load the trade data"""
-    data_path = os.path.join(DATA_DIR, 'trade_data.csv')
+    """Load the trade data, preferring whichever of the Parquet or CSV file was written last"""
+    parquet_path = os.path.join(DATA_DIR, 'trade_data.parquet')
+    csv_path = os.path.join(DATA_DIR, 'trade_data.csv')
+    
+    candidates = [p for p in (parquet_path, csv_path) if os.path.exists(p)]
+    if not candidates:
+        raise FileNotFoundError(f"Data file not found: {parquet_path} or {csv_path}")
+    
+    data_path = max(candidates, key=os.path.getmtime)
+    
+    # Trade values in millions USD need far less than float64 precision
+    if data_path == parquet_path:
+        # Parquet already stores the date column as datetime
+        df = pd.read_parquet(data_path)
+        df[TRADE_COLS] = df[TRADE_COLS].astype('float32')
+    else:
+        df = load_csv_data(csv_path)
+    
+    # Group on integer category codes rather than period strings. Labels outside
+    # PERIOD_ORDER would silently become NaN and drop out of the analysis, so reject them.
+    unknown = df['period'][~df['period'].isin(PERIOD_ORDER) & df['period'].notna()].unique()
+    if len(unknown):
+        raise ValueError(f"Unknown periods in {data_path}: {', '.join(map(str, unknown))} "
+                         f"(expected one of {', '.join(PERIOD_ORDER)})")
+    df['period'] = df['period'].astype(pd.CategoricalDtype(PERIOD_ORDER, ordered=True))
+    
+    # Trade balances, computed once for all plots
+    df['colombia_us_balance'] = df['colombia_us_exports'] - df['colombia_us_imports']
+    df['colombia_china_balance'] = df['colombia_china_exports'] - df['colombia_china_imports']
+    df['total_balance'] = df['colombia_us_balance'] + df['colombia_china_balance']
     
-    if not os.path.exists(data_path):
-        raise FileNotFoundError(f"Data file not found: {data_path}")
+    return df
+
+def load_csv_data(csv_path):
+    """
+    Read the CSV trade data, reusing a parsed Parquet copy from an earlier run when available
     
-    df = pd.read_csv(data_path)
-    # Convert date column to datetime
-    df['date'] = pd.to_datetime(df['date'])
+    Parameters:
+    csv_path (str): Path of the CSV file
+    
+    Returns:
+    DataFrame: Trade data with float32 trade columns
+    """
+    # Key the copy on the CSV's modification time so an edited file is parsed again
+    cache_path = os.path.join(CACHE_DIR, f"trade_data_csv_{os.stat(csv_path).st_mtime_ns}.parquet")
+    if os.path.exists(cache_path):
+        return pd.read_parquet(cache_path)
+    
+    # The pyarrow parser reads the CSV and converts the dates in one multi-threaded pass
+    df = pd.read_csv(csv_path, engine='pyarrow', parse_dates=['date'],
+                     dtype={c: 'float32' for c in TRADE_COLS})
+    
+    # Replace copies of older versions of the CSV
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith('trade_data_csv_'):
+            os.remove(os.path.join(CACHE_DIR, name))
+    df.to_parquet(cache_path, engine='pyarrow', compression='zstd', index=False)
     return df
 
+def draw_tariff_lines(ax, max_date):
+    """
+    Mark the tariff events covered by the data as vertical lines
+    
+    Parameters:
+    ax (Axes): Axes to draw on
+    max_date (Timestamp): Last date in the plotted data; later events are skipped
+    """
+    for ts, color, label in TARIFF_LINES:
+        if ts <= max_date:
+            ax.axvline(x=ts, color=color, linestyle='--', alpha=0.5, label=label)
+
+def save_figure(fig, name):
+    """
+    Save a figure to the results directory as a lossless WebP image
+    
+    Parameters:
+    fig (Figure): Figure to save
+    name (str): File name without extension
+    """
+    fig.savefig(os.path.join(RESULTS_DIR, f'{name}.webp'), pil_kwargs={'lossless': True})
+
+def lttb_indices(x, y, n_out):
+    """
+    Pick the points to keep when downsampling a line with Largest-Triangle-Three-Buckets
+    
+    Parameters:
+    x (ndarray): Sorted x values as numbers
+    y (ndarray): y values
+    n_out (int): Number of points to keep
+    
+    Returns:
+    ndarray: Indices of the kept points, always including the first and last
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # Split the interior points into n_out - 2 buckets and keep, from each, the
+    # point forming the largest triangle with the previously kept point and the
+    # mean of the next bucket
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(int) + 1
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+def plot_series(ax, dates, values, **kwargs):
+    """
+    Plot a time series as a line, downsampled to MAX_PLOT_POINTS with LTTB
+    
+    Parameters:
+    ax (Axes): Axes to draw on
+    dates (Series): Dates for the x axis
+    values (Series): Values for the y axis
+    **kwargs: Passed through to Axes.plot
+    """
+    x = dates.to_numpy()
+    y = values.to_numpy()
+    idx = lttb_indices(x.astype('int64').astype('float64'), y, MAX_PLOT_POINTS)
+    ax.plot(x[idx], y[idx], **kwargs)
+
 def analyze_period_changes(data):
     """
     Analyze changes across different tariff periods
@@ -60,134 +219,104 @@ def analyze_period_changes(data):
     DataFrame: Summary statistics by period
     DataFrame: Changes between periods
     """
-    # Aggregate data by period
-    period_summary = data.groupby('period').agg({
-        'colombia_us_exports': 'mean',
-        'colombia_us_imports': 'mean',
-        'colombia_china_exports': 'mean',
-        'colombia_china_imports': 'mean'
-    }).reset_index()
-    
-    # Set a preferred order for periods
-    period_order = ['pre-tariff', 'during-tariff', 'post-tariff', 'new-2025-tariff', 'post-new-2025-tariff']
-    period_summary['period_order'] = period_summary['period'].apply(lambda x: period_order.index(x) if x in period_order else 999)
-    period_summary = period_summary.sort_values('period_order').drop('period_order', axis=1)
-    
-    # Calculate trade balances
-    period_summary['colombia_us_balance'] = period_summary['colombia_us_exports'] - period_summary['colombia_us_imports']
-    period_summary['colombia_china_balance'] = period_summary['colombia_china_exports'] - period_summary['colombia_china_imports']
-    period_summary['total_balance'] = period_summary['colombia_us_balance'] + period_summary['colombia_china_balance']
-    
-    # Calculate percentage changes between periods
+    # Aggregate data by period, order the periods and derive trade balances in one pipeline
+    period_summary = (
+        data.groupby('period', observed=True, sort=False)[TRADE_COLS].mean()
+        .pipe(lambda df: df.reindex([p for p in PERIOD_ORDER if p in df.index]))
+        .reset_index()
+        .assign(
+            colombia_us_balance=lambda df: df['colombia_us_exports'] - df['colombia_us_imports'],
+            colombia_china_balance=lambda df: df['colombia_china_exports'] - df['colombia_china_imports'],
+        )
+        .assign(total_balance=lambda df: df['colombia_us_balance'] + df['colombia_china_balance'])
+    )
+    
+    # Calculate percentage changes between consecutive periods for all metrics at once
     periods = period_summary['period'].tolist()
-    changes = {}
+    numeric = period_summary.drop(columns=['period'])
+    values = numeric.to_numpy()
+    prev, curr = values[:-1], values[1:]
     
-    for i in range(len(periods)-1):
-        period1 = periods[i]
-        period2 = periods[i+1]
-        
-        changes[f"{period1}_to_{period2}"] = {}
-        
-        for col in period_summary.columns:
-            if col == 'period':
-                continue
-            
-            val1 = period_summary[period_summary['period'] == period1][col].values[0]
-            val2 = period_summary[period_summary['period'] == period2][col].values[0]
-            
-            if val1 != 0:  # Avoid division by zero
-                pct_change = ((val2 - val1) / abs(val1)) * 100
-            else:
-                pct_change = np.nan
-                
-            changes[f"{period1}_to_{period2}"][col] = pct_change
+    denom = np.where(prev != 0, np.abs(prev), np.nan)  # Avoid division by zero
+    pct_changes = (curr - prev) / denom * 100
     
-    changes_df = pd.DataFrame(changes).T
+    transitions = [f"{p1}_to_{p2}" for p1, p2 in zip(periods[:-1], periods[1:])]
+    changes_df = pd.DataFrame(pct_changes, index=transitions, columns=numeric.columns)
     
     return period_summary, changes_df
 
-def create_time_series_visualizations(data):
+def plot_trade_pair(ax, data, export_col, import_col, partner, title, ylabel, max_date, zero_line=False):
     """
-    Create time series visualizations for trade data
+    Plot Colombia's exports to and imports from one partner on an axes
     
     Parameters:
-    data (DataFrame): Trade data
+    ax (Axes): Axes to draw on
+    data (DataFrame): Trade data with a date column
+    export_col (str): Column with exports to the partner
+    import_col (str): Column with imports from the partner
+    partner (str): Partner name used in the legend
+    title (str): Axes title
+    ylabel (str): Y axis label
+    max_date (Timestamp): Last date in the data, used to skip later tariff events
+    zero_line (bool): Whether to draw a horizontal line at zero
     """
-    # Trade volume over time
-    plt.figure(figsize=(14, 10))
-    
-    # Create line plots for exports and imports
-    plt.subplot(2, 1, 1)
-    plt.plot(data['date'], data['colombia_us_exports'], label='Colombia Exports to US')
-    plt.plot(data['date'], data['colombia_us_imports'], label='Colombia Imports from US')
+    plot_series(ax, data['date'], data[export_col], label=f'Colombia Exports to {partner}')
+    plot_series(ax, data['date'], data[import_col], label=f'Colombia Imports from {partner}')
     
     # Add vertical lines for tariff periods - both Trump and 2025
-    plt.axvline(x=pd.to_datetime(TARIFF_START), color='r', linestyle='--', alpha=0.5, label='Trump Tariffs Begin')
-    plt.axvline(x=pd.to_datetime(TARIFF_END), color='g', linestyle='--', alpha=0.5, label='Trump Tariffs End')
+    draw_tariff_lines(ax, max_date)
     
-    # Add 2025 tariff lines if data extends to that period
-    if data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_START_APPROX):
-        plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_START_APPROX), color='purple', linestyle='--', alpha=0.5, label='2025 Universal Tariff')
-        if data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_END_ONGOING):
-            plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_END_ONGOING), color='orange', linestyle='--', alpha=0.5, label='US-China Agreement')
+    if zero_line:
+        ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
     
-    plt.title('Colombia-US Trade (2016-2025)')
-    plt.ylabel('Trade Volume (Millions USD)')
-    plt.legend(loc='best')
-    
-    plt.subplot(2, 1, 2)
-    plt.plot(data['date'], data['colombia_china_exports'], label='Colombia Exports to China')
-    plt.plot(data['date'], data['colombia_china_imports'], label='Colombia Imports from China')
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    ax.legend(loc='best')
+
+def create_time_series_visualizations(data):
+    """
+    Create time series visualizations for trade data
     
-    # Add vertical lines for tariff periods - both Trump and 2025
-    plt.axvline(x=pd.to_datetime(TARIFF_START), color='r', linestyle='--', alpha=0.5, label='Trump Tariffs Begin')
-    plt.axvline(x=pd.to_datetime(TARIFF_END), color='g', linestyle='--', alpha=0.5, label='Trump Tariffs End')
+    Parameters:
+    data (DataFrame): Trade data
+    """
+    # Scan the dates once for the tariff lines of every figure
+    max_date = data['date'].max()
     
-    # Add 2025 tariff lines if data extends to that period
-    if data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_START_APPROX):
-        plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_START_APPROX), color='purple', linestyle='--', alpha=0.5, label='2025 Universal Tariff')
-        if data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_END_ONGOING):
-            plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_END_ONGOING), color='orange', linestyle='--', alpha=0.5, label='US-China Agreement')
+    # Trade volume over time
+    fig, axes = plt.subplots(2, 1, figsize=(14, 10))
     
-    plt.title('Colombia-China Trade (2016-2025)')
-    plt.xlabel('Date')
-    plt.ylabel('Trade Volume (Millions USD)')
-    plt.legend(loc='best')
+    pairs = [
+        ('colombia_us_exports', 'colombia_us_imports', 'US', 'Colombia-US Trade (2016-2025)'),
+        ('colombia_china_exports', 'colombia_china_imports', 'China', 'Colombia-China Trade (2016-2025)'),
+    ]
+    for ax, (export_col, import_col, partner, title) in zip(axes, pairs):
+        plot_trade_pair(ax, data, export_col, import_col, partner, title, 'Trade Volume (Millions USD)', max_date)
+    axes[-1].set_xlabel('Date')
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(RESULTS_DIR, 'trade_volume_time_series.png'), dpi=300)
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, 'trade_volume_time_series')
+    plt.close(fig)
     
     # Trade balances over time
-    data['colombia_us_balance'] = data['colombia_us_exports'] - data['colombia_us_imports']
-    data['colombia_china_balance'] = data['colombia_china_exports'] - data['colombia_china_imports']
-    data['total_balance'] = data['colombia_us_balance'] + data['colombia_china_balance']
-    
-    plt.figure(figsize=(14, 8))
-    plt.plot(data['date'], data['colombia_us_balance'], label='Colombia-US Balance')
-    plt.plot(data['date'], data['colombia_china_balance'], label='Colombia-China Balance')
-    plt.plot(data['date'], data['total_balance'], label='Total Balance', linestyle='--')
+    fig, ax = plt.subplots(figsize=(14, 8))
+    plot_series(ax, data['date'], data['colombia_us_balance'], label='Colombia-US Balance')
+    plot_series(ax, data['date'], data['colombia_china_balance'], label='Colombia-China Balance')
+    plot_series(ax, data['date'], data['total_balance'], label='Total Balance', linestyle='--')
     
     # Add vertical lines for tariff periods - both Trump and 2025
-    plt.axvline(x=pd.to_datetime(TARIFF_START), color='r', linestyle='--', alpha=0.5, label='Trump Tariffs Begin')
-    plt.axvline(x=pd.to_datetime(TARIFF_END), color='g', linestyle='--', alpha=0.5, label='Trump Tariffs End')
-    
-    # Add 2025 tariff lines if data extends to that period
-    if data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_START_APPROX):
-        plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_START_APPROX), color='purple', linestyle='--', alpha=0.5, label='2025 Universal Tariff')
-        if data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_END_ONGOING):
-            plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_END_ONGOING), color='orange', linestyle='--', alpha=0.5, label='US-China Agreement')
-            
-    plt.axhline(y=0, color='k', linestyle='-', alpha=0.3)
+    draw_tariff_lines(ax, max_date)
+    
+    ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
     
-    plt.title('Colombia Trade Balances (2016-2025)')
-    plt.xlabel('Date')
-    plt.ylabel('Trade Balance (Millions USD)')
-    plt.legend(loc='best')
+    ax.set_title('Colombia Trade Balances (2016-2025)')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Trade Balance (Millions USD)')
+    ax.legend(loc='best')
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(RESULTS_DIR, 'trade_balance_time_series.png'), dpi=300)
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, 'trade_balance_time_series')
+    plt.close(fig)
 
 def create_period_comparisons(period_summary, changes_df):
     """
@@ -198,7 +327,7 @@ def create_period_comparisons(period_summary, changes_df):
     changes_df (DataFrame): Changes between periods
     """
     # Bar chart of average trade volumes by period
-    plt.figure(figsize=(16, 10))
+    fig, ax = plt.subplots(figsize=(16, 10))
     
     metrics = ['colombia_us_exports', 'colombia_us_imports', 
                'colombia_china_exports', 'colombia_china_imports']
@@ -210,22 +339,23 @@ def create_period_comparisons(period_summary, changes_df):
     colors = sns.color_palette("viridis", n_colors=len(period_summary))
     
     # Create the bar chart with each period
-    for i, (idx, row) in enumerate(period_summary.iterrows()):
+    for i, row in enumerate(period_summary.to_dict('records')):
         values = [row[m] for m in metrics]
-        plt.bar(index + i*bar_width, values, bar_width, label=row['period'], color=colors[i])
+        ax.bar(index + i*bar_width, values, bar_width, label=row['period'], color=colors[i])
     
-    plt.xlabel('Trade Flow')
-    plt.ylabel('Average Volume (Millions USD)')
-    plt.title('Average Trade Volumes by Period (Including 2025 Tariffs)')
-    plt.xticks(index + bar_width * (len(period_summary)-1)/2, ['COL→US', 'US→COL', 'COL→CHN', 'CHN→COL'])
-    plt.legend()
+    ax.set_xlabel('Trade Flow')
+    ax.set_ylabel('Average Volume (Millions USD)')
+    ax.set_title('Average Trade Volumes by Period (Including 2025 Tariffs)')
+    ax.set_xticks(index + bar_width * (len(period_summary)-1)/2)
+    ax.set_xticklabels(['COL→US', 'US→COL', 'COL→CHN', 'CHN→COL'])
+    ax.legend()
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(RESULTS_DIR, 'trade_volume_by_period.png'), dpi=300)
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, 'trade_volume_by_period')
+    plt.close(fig)
     
     # Heatmap of percentage changes between periods
-    plt.figure(figsize=(14, 10))
+    fig, ax = plt.subplots(figsize=(14, 10))
     
     # Select relevant columns for the heatmap
     heatmap_cols = ['colombia_us_exports', 'colombia_us_imports', 
@@ -233,94 +363,62 @@ def create_period_comparisons(period_summary, changes_df):
                     'colombia_us_balance', 'colombia_china_balance']
     
     # Create heatmap of changes
-    sns.heatmap(changes_df[heatmap_cols], annot=True, cmap='RdYlGn', center=0, fmt='.1f')
+    sns.heatmap(changes_df[heatmap_cols], annot=True, cmap='RdYlGn', center=0, fmt='.1f', ax=ax)
     
-    plt.title('Percentage Changes Between Periods (%) - Including 2025 Tariffs')
-    plt.ylabel('Period Transition')
-    plt.tight_layout()
-    plt.savefig(os.path.join(RESULTS_DIR, 'trade_changes_heatmap.png'), dpi=300)
-    plt.close()
+    ax.set_title('Percentage Changes Between Periods (%) - Including 2025 Tariffs')
+    ax.set_ylabel('Period Transition')
+    fig.tight_layout()
+    save_figure(fig, 'trade_changes_heatmap')
+    plt.close(fig)
     
     # Trade balance comparison
-    plt.figure(figsize=(14, 8))
+    fig, axes = plt.subplots(1, 3, figsize=(14, 8))
     
     balance_cols = ['colombia_us_balance', 'colombia_china_balance', 'total_balance']
     
-    for i, balance in enumerate(balance_cols):
-        plt.subplot(1, 3, i+1)
-        sns.barplot(x='period', y=balance, data=period_summary)
-        plt.title(balance.replace('_', ' ').title())
-        plt.xticks(rotation=45)
+    # One bar chart per balance column, drawn in a single pass
+    period_summary.set_index('period')[balance_cols].plot.bar(ax=axes, subplots=True, legend=False)
+    for ax, balance in zip(axes, balance_cols):
+        ax.set_title(balance.replace('_', ' ').title())
+        ax.set_ylabel(balance)
+        ax.tick_params(axis='x', rotation=45)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(RESULTS_DIR, 'trade_balance_by_period.png'), dpi=300)
-    plt.close()
+    fig.tight_layout()
+    save_figure(fig, 'trade_balance_by_period')
+    plt.close(fig)
 
-def create_relative_change_visualization(data):
+def create_relative_change_visualization(data, period_summary):
     """
     Create visualization showing relative changes from pre-tariff baseline
     
     Parameters:
     data (DataFrame): Trade data
+    period_summary (DataFrame): Summary statistics by period
     """
-    # Calculate baseline (average for pre-tariff period)
-    baseline = data[data['period'] == 'pre-tariff'].groupby('period').mean().reset_index()
-    
-    # Calculate relative changes for each trade flow
-    rel_data = data.copy()
+    # Baseline is the pre-tariff period average already computed in the period summary
+    baseline = period_summary.set_index('period').loc['pre-tariff', TRADE_COLS].to_numpy(dtype=float)
     
-    for col in ['colombia_us_exports', 'colombia_us_imports', 
-                'colombia_china_exports', 'colombia_china_imports']:
-        baseline_val = baseline[col].values[0]
-        rel_data[f'{col}_rel'] = (rel_data[col] / baseline_val - 1) * 100
+    # Calculate relative changes for all trade flows in one broadcast
+    rel = (data[TRADE_COLS].to_numpy() / baseline - 1.0) * 100.0
+    rel_data = data.assign(**{f'{col}_rel': rel[:, i] for i, col in enumerate(TRADE_COLS)})
     
     # Plot relative changes
-    plt.figure(figsize=(14, 10))
-    
-    plt.subplot(2, 1, 1)
-    plt.plot(rel_data['date'], rel_data['colombia_us_exports_rel'], label='Colombia Exports to US')
-    plt.plot(rel_data['date'], rel_data['colombia_us_imports_rel'], label='Colombia Imports from US')
-    
-    # Add vertical lines for tariff periods - both Trump and 2025
-    plt.axvline(x=pd.to_datetime(TARIFF_START), color='r', linestyle='--', alpha=0.5, label='Trump Tariffs Begin')
-    plt.axvline(x=pd.to_datetime(TARIFF_END), color='g', linestyle='--', alpha=0.5, label='Trump Tariffs End')
-    
-    # Add 2025 tariff lines if data extends to that period
-    if rel_data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_START_APPROX):
-        plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_START_APPROX), color='purple', linestyle='--', alpha=0.5, label='2025 Universal Tariff')
-        if rel_data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_END_ONGOING):
-            plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_END_ONGOING), color='orange', linestyle='--', alpha=0.5, label='US-China Agreement')
-    
-    plt.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-    
-    plt.title('Relative Change in Colombia-US Trade (% from pre-tariff baseline)')
-    plt.ylabel('Change (%)')
-    plt.legend(loc='best')
-    
-    plt.subplot(2, 1, 2)
-    plt.plot(rel_data['date'], rel_data['colombia_china_exports_rel'], label='Colombia Exports to China')
-    plt.plot(rel_data['date'], rel_data['colombia_china_imports_rel'], label='Colombia Imports from China')
-    
-    # Add vertical lines for tariff periods - both Trump and 2025
-    plt.axvline(x=pd.to_datetime(TARIFF_START), color='r', linestyle='--', alpha=0.5, label='Trump Tariffs Begin')
-    plt.axvline(x=pd.to_datetime(TARIFF_END), color='g', linestyle='--', alpha=0.5, label='Trump Tariffs End')
-    
-    # Add 2025 tariff lines if data extends to that period
-    if rel_data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_START_APPROX):
-        plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_START_APPROX), color='purple', linestyle='--', alpha=0.5, label='2025 Universal Tariff')
-        if rel_data['date'].max() >= pd.to_datetime(NEW_2025_TARIFF_END_ONGOING):
-            plt.axvline(x=pd.to_datetime(NEW_2025_TARIFF_END_ONGOING), color='orange', linestyle='--', alpha=0.5, label='US-China Agreement')
-            
-    plt.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-    
-    plt.title('Relative Change in Colombia-China Trade (% from pre-tariff baseline)')
-    plt.xlabel('Date')
-    plt.ylabel('Change (%)')
-    plt.legend(loc='best')
-    
-    plt.tight_layout()
-    plt.savefig(os.path.join(RESULTS_DIR, 'trade_relative_changes.png'), dpi=300)
-    plt.close()
+    max_date = data['date'].max()
+    fig, axes = plt.subplots(2, 1, figsize=(14, 10))
+    
+    pairs = [
+        ('colombia_us_exports_rel', 'colombia_us_imports_rel', 'US',
+         'Relative Change in Colombia-US Trade (% from pre-tariff baseline)'),
+        ('colombia_china_exports_rel', 'colombia_china_imports_rel', 'China',
+         'Relative Change in Colombia-China Trade (% from pre-tariff baseline)'),
+    ]
+    for ax, (export_col, import_col, partner, title) in zip(axes, pairs):
+        plot_trade_pair(ax, rel_data, export_col, import_col, partner, title, 'Change (%)', max_date, zero_line=True)
+    axes[-1].set_xlabel('Date')
+    
+    fig.tight_layout()
+    save_figure(fig, 'trade_relative_changes')
+    plt.close(fig)
 
 def generate_html_report(period_summary, changes_df, data):
     """
@@ -351,7 +449,8 @@ def generate_html_report(period_summary, changes_df, data):
     # Check if we have data for 2025 tariffs
     has_2025_data = 'new-2025-tariff' in period_summary['period'].values
     
-    html_content = f"""
+    # Collect the report as fragments and join them once at the end
+    parts = [f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -386,10 +485,13 @@ def generate_html_report(period_summary, changes_df, data):
                     <th>Colombia to China Exports</th>
                     <th>China to Colombia Imports</th>
                 </tr>
-    """
+    """]
+    
+    # Plain dicts per row; avoids building a Series for every row
+    summary_rows = period_summary.to_dict('records')
     
     # Add period summary data with color coding for tariff periods
-    for _, row in period_summary.iterrows():
+    for row in summary_rows:
         period = row['period']
         period_class = ""
         
@@ -398,7 +500,7 @@ def generate_html_report(period_summary, changes_df, data):
         elif period in ['new-2025-tariff', 'post-new-2025-tariff']:
             period_class = "class='period-2025'"
             
-        html_content += f"""
+        parts.append(f"""
                 <tr {period_class}>
                     <td>{period}</td>
                     <td>{row['colombia_us_exports']:.2f}</td>
@@ -406,9 +508,9 @@ def generate_html_report(period_summary, changes_df, data):
                     <td>{row['colombia_china_exports']:.2f}</td>
                     <td>{row['colombia_china_imports']:.2f}</td>
                 </tr>
-        """
+        """)
     
-    html_content += """
+    parts.append("""
             </table>
             
             <h2>Trade Balance Statistics</h2>
@@ -419,10 +521,10 @@ def generate_html_report(period_summary, changes_df, data):
                     <th>Colombia-China Balance</th>
                     <th>Total Balance</th>
                 </tr>
-    """
+    """)
     
     # Add trade balance data with color coding for tariff periods
-    for _, row in period_summary.iterrows():
+    for row in summary_rows:
         period = row['period']
         period_class = ""
         
@@ -431,16 +533,16 @@ def generate_html_report(period_summary, changes_df, data):
         elif period in ['new-2025-tariff', 'post-new-2025-tariff']:
             period_class = "class='period-2025'"
             
-        html_content += f"""
+        parts.append(f"""
                 <tr {period_class}>
                     <td>{period}</td>
                     <td>{row['colombia_us_balance']:.2f}</td>
                     <td>{row['colombia_china_balance']:.2f}</td>
                     <td>{row['total_balance']:.2f}</td>
                 </tr>
-        """
+        """)
     
-    html_content += """
+    parts.append("""
             </table>
             
             <h2>Percentage Changes Between Periods</h2>
@@ -452,28 +554,28 @@ def generate_html_report(period_summary, changes_df, data):
                     <th>Colombia to China Exports</th>
                     <th>China to Colombia Imports</th>
                 </tr>
-    """
+    """)
     
     # Add changes data with color coding
-    for transition, row in changes_df.iterrows():
-        html_content += f"""
+    for transition, row in zip(changes_df.index, changes_df.to_dict('records')):
+        parts.append(f"""
                 <tr>
                     <td>{transition}</td>
-        """
+        """)
         
         for col in ['colombia_us_exports', 'colombia_us_imports', 
                     'colombia_china_exports', 'colombia_china_imports']:
             value = row[col]
             if pd.isna(value):
-                html_content += f"<td>N/A</td>"
+                parts.append(f"<td>N/A</td>")
             elif value > 0:
-                html_content += f"<td class='highlight-positive'>+{value:.2f}%</td>"
+                parts.append(f"<td class='highlight-positive'>+{value:.2f}%</td>")
             else:
-                html_content += f"<td class='highlight-negative'>{value:.2f}%</td>"
+                parts.append(f"<td class='highlight-negative'>{value:.2f}%</td>")
         
-        html_content += """
+        parts.append("""
                 </tr>
-        """
+        """)
     
     # Get transitions for key findings
     trump_start_transition = next((t for t in available_transitions if 'pre-tariff_to_during-tariff' in t), None)
@@ -483,79 +585,79 @@ def generate_html_report(period_summary, changes_df, data):
     tariff_2025_start = next((t for t in available_transitions if 'post-tariff_to_new-2025-tariff' in t), None)
     tariff_2025_agreement = next((t for t in available_transitions if 'new-2025-tariff_to_post-new-2025-tariff' in t), None)
     
-    html_content += f"""
+    parts.append(f"""
             </table>
             
             <h2>Visualizations</h2>
             
             <h3>Trade Volume Over Time</h3>
-            <img src="trade_volume_time_series.png" alt="Trade Volume Time Series">
+            <img src="trade_volume_time_series.webp" alt="Trade Volume Time Series">
             
             <h3>Trade Balance Over Time</h3>
-            <img src="trade_balance_time_series.png" alt="Trade Balance Time Series">
+            <img src="trade_balance_time_series.webp" alt="Trade Balance Time Series">
             
             <h3>Trade Volume by Period</h3>
-            <img src="trade_volume_by_period.png" alt="Trade Volume by Period">
+            <img src="trade_volume_by_period.webp" alt="Trade Volume by Period">
             
             <h3>Trade Changes Between Periods</h3>
-            <img src="trade_changes_heatmap.png" alt="Trade Changes Heatmap">
+            <img src="trade_changes_heatmap.webp" alt="Trade Changes Heatmap">
             
             <h3>Trade Balance by Period</h3>
-            <img src="trade_balance_by_period.png" alt="Trade Balance by Period">
+            <img src="trade_balance_by_period.webp" alt="Trade Balance by Period">
             
             <h3>Relative Changes from Pre-Tariff Baseline</h3>
-            <img src="trade_relative_changes.png" alt="Relative Trade Changes">
+            <img src="trade_relative_changes.webp" alt="Relative Trade Changes">
             
             <h2>Key Findings</h2>
             <h3>Trump Administration Tariffs (2018-2021)</h3>
             <ul>
-    """
+    """)
     
     if trump_start_transition:
-        html_content += f"""
+        parts.append(f"""
                 <li>During the Trump tariff period, Colombia's exports to the US showed a {safe_get_change(trump_start_transition, 'colombia_us_exports'):.1f}% change.</li>
                 <li>Imports from the US to Colombia changed by {safe_get_change(trump_start_transition, 'colombia_us_imports'):.1f}% during the Trump tariff period.</li>
                 <li>Colombia's exports to China increased by {safe_get_change(trump_start_transition, 'colombia_china_exports'):.1f}% during the Trump tariff period, suggesting possible trade diversion.</li>
                 <li>Imports from China to Colombia increased by {safe_get_change(trump_start_transition, 'colombia_china_imports'):.1f}% during the same period.</li>
-        """
+        """)
     
     if trump_end_transition:
-        html_content += f"""
+        parts.append(f"""
                 <li>After the Trump tariffs ended, Colombia-US trade showed signs of {
                     "recovery" if safe_get_change(trump_end_transition, 'colombia_us_exports') > 0 else "continued decline"
                 }.</li>
-        """
+        """)
     
-    html_content += """
+    parts.append("""
             </ul>
-    """
+    """)
     
     # Add 2025 tariff findings if data is available
     if has_2025_data:
-        html_content += f"""
+        parts.append(f"""
             <h3>2025 Universal U.S. Reciprocal Tariff</h3>
             <ul>
-        """
+        """)
         
         if tariff_2025_start:
-            html_content += f"""
+            parts.append(f"""
                 <li>When the 2025 Universal 10% Reciprocal Tariff was implemented, Colombia's exports to the US showed a {safe_get_change(tariff_2025_start, 'colombia_us_exports'):.1f}% change.</li>
                 <li>Imports from the US to Colombia changed by {safe_get_change(tariff_2025_start, 'colombia_us_imports'):.1f}% after the 2025 tariff implementation.</li>
                 <li>Colombia's exports to China changed by {safe_get_change(tariff_2025_start, 'colombia_china_exports'):.1f}% during the 2025 tariff period.</li>
                 <li>Imports from China to Colombia changed by {safe_get_change(tariff_2025_start, 'colombia_china_imports'):.1f}% during the same period.</li>
-            """
+            """)
             
         if tariff_2025_agreement:
-            html_content += f"""
+            parts.append(f"""
                 <li>After the US-China 90-day agreement, there was a {safe_get_change(tariff_2025_agreement, 'colombia_us_exports'):.1f}% change in Colombia's exports to the US.</li>
                 <li>The agreement's impact on Colombia-China trade showed a {safe_get_change(tariff_2025_agreement, 'colombia_china_exports'):.1f}% change in exports from Colombia to China.</li>
-            """
+            """)
             
-        html_content += """
+        parts.append("""
             </ul>
-        """
+        """)
     
-    html_content += f"""
+    parts.append(f"""
             <h2>Conclusions</h2>
             <p>The analysis suggests that both the Trump administration tariffs and the 2025 Universal U.S. Reciprocal Tariff had measurable impacts on Colombia's trade patterns.
             There appears to be evidence of trade diversion between the US and China during both tariff periods, particularly in terms
@@ -578,11 +680,11 @@ def generate_html_report(period_summary, changes_df, data):
         </div>
     </body>
     </html>
-    """
+    """)
     
     # Write HTML to file
     with open(os.path.join(RESULTS_DIR, 'trade_analysis_report.html'), 'w') as f:
-        f.write(html_content)
+        f.write(''.join(parts))
 
 def main():
     """Main function to analyze trade data and generate visualizations"""
@@ -597,9 +699,20 @@ def main():
         
         # Create visualizations
         print("Creating visualizations...")
-        create_time_series_visualizations(data)
-        create_period_comparisons(period_summary, changes_df)
-        create_relative_change_visualization(data)
+        plot_jobs = [(create_time_series_visualizations, (data,)),
+                     (create_period_comparisons, (period_summary, changes_df)),
+                     (create_relative_change_visualization, (data, period_summary))]
+        
+        # Each figure set only reads its inputs and writes its own files, so large data can be
+        # drawn concurrently; below that the worker start-up costs more than it saves
+        if len(data) >= PARALLEL_PLOT_MIN_ROWS and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=PLOT_WORKERS) as executor:
+                futures = [executor.submit(func, *args) for func, args in plot_jobs]
+                for future in futures:
+                    future.result()
+        else:
+            for func, args in plot_jobs:
+                func(*args)
         
         # Generate HTML report
         print("Generating HTML report...")
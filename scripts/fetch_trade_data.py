@@ -8,11 +8,16 @@ This script connects to public APIs to retrieve historical trade data
 
 import os
 import sys
+import argparse
+import atexit
+import multiprocessing
 import pandas as pd
 import numpy as np
-import requests
-import json
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 import time
 
 # Define time periods of interest
@@ -34,10 +39,170 @@ NEW_2025_TARIFF_START_APPROX = '2025-04-05'  # Start of Universal 10% Reciprocal
 NEW_2025_TARIFF_END_ONGOING = '2025-05-13'  # For analysis purposes, using the US-China agreement date
 MOST_RECENT_DATA_CONTEXT_2025 = '2025-05-13'  # Reflecting the start of the US-China 90-day agreement
 
+# Period labels in chronological order, and the start of each period as
+# datetime64 parsed once at import; the first boundary is an open-ended lower
+# bound for the pre-tariff period
+PERIODS = ['pre-tariff', 'during-tariff', 'post-tariff', 'new-2025-tariff', 'post-new-2025-tariff']
+PERIOD_BOUNDARIES = np.array(['1900-01-01', TARIFF_START, TARIFF_END,
+                              NEW_2025_TARIFF_START_APPROX, NEW_2025_TARIFF_END_ONGOING], dtype='datetime64[ns]')
+
 # Create data directory if it doesn't exist
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# Raw API responses are cached on disk so repeated runs skip the network
+CACHE_DIR = os.path.join(DATA_DIR, '.cache')
+CACHE_TTL = 7 * 24 * 60 * 60  # Seconds before a cached response is fetched again
+
+# The free Comtrade tier accepts up to five comma-separated years per request
+COMTRADE_MAX_YEARS_PER_REQUEST = 5
+
+# UN Comtrade API has request limits: at most one request per second overall,
+# with a few requests allowed in flight at once
+COMTRADE_REQUESTS_PER_SECOND = 1.0
+COMTRADE_MAX_WORKERS = 4
+
+# Record fields returned by the Comtrade API, in the order used for DataFrames
+COMTRADE_COLUMNS = (
+    'pfCode', 'yr', 'period', 'periodDesc', 'aggrLevel', 'IsLeaf',
+    'rgCode', 'rgDesc', 'rtCode', 'rtTitle', 'rt3ISO',
+    'ptCode', 'ptTitle', 'pt3ISO', 'ptCode2', 'ptTitle2', 'pt3ISO2',
+    'cstCode', 'cstDesc', 'motCode', 'motDesc', 'cmdCode', 'cmdDescE',
+    'qtCode', 'qtDesc', 'qtAltCode', 'qtAltDesc',
+    'TradeQuantity', 'AltQuantity', 'NetWeight', 'GrossWeight',
+    'TradeValue', 'CIFValue', 'FOBValue', 'estCode',
+)
+
+# Worker processes used to fetch several country pairs side by side
+COMTRADE_PAIR_WORKERS = 2
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter
+    
+    Tokens refill continuously at `rate` per second up to `capacity`. Each
+    request takes one token, sleeping only for the time until the next token
+    is available, so time already spent waiting on slow responses counts
+    towards the limit.
+    """
+    
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available and take it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                time.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1
+                self.last = time.monotonic()
+            self.tokens -= 1
+
+comtrade_rate_limiter = TokenBucket(COMTRADE_REQUESTS_PER_SECOND)
+
+@lru_cache(maxsize=1)
+def get_session():
+    """
+    Shared HTTP session for API calls
+    
+    Keeps connections alive across requests and retries rate-limited (429)
+    and transient server errors with exponential backoff.
+    """
+    # Imported here so the sample-data path does not pay for the HTTP stack
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount('https://', adapter)
+    return session
+
+def fetch_comtrade_years(reporter, partner, years):
+    """
+    Fetch several years of UN Comtrade data in one request, reusing a fresh on-disk copy if available
+    
+    Parameters:
+    reporter (str): Reporter country code
+    partner (str): Partner country code
+    years (tuple): Years to fetch, at most COMTRADE_MAX_YEARS_PER_REQUEST
+    
+    Returns:
+    DataFrame: Trade records with COMTRADE_COLUMNS, or None if the request failed
+    """
+    import requests
+    
+    try:
+        # Hand out a copy so callers cannot modify the cached frame
+        return load_comtrade_years(reporter, partner, years).copy()
+    except requests.HTTPError as e:
+        print(f"Error fetching data: {e.response.status_code}")
+        return None
+
+@lru_cache(maxsize=None)
+def load_comtrade_years(reporter, partner, years):
+    """
+    Cached worker for fetch_comtrade_years
+    
+    Raises requests.HTTPError on a failed request, so failures are never cached and get retried.
+    """
+    import orjson
+    
+    ps = ",".join(map(str, years))
+    cache_path = os.path.join(CACHE_DIR, f"{reporter}_{partner}_{ps.replace(',', '_')}.json")
+    
+    payload = None
+    if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < CACHE_TTL:
+        with open(cache_path, 'rb') as f:
+            body = f.read()
+        try:
+            payload = orjson.loads(body)
+            print(f"Using cached data for {reporter}-{partner} for {ps}")
+        except orjson.JSONDecodeError:
+            # A damaged cache file counts as a miss and is replaced by a fresh download
+            print(f"Ignoring unreadable cached data for {reporter}-{partner} for {ps}")
+    
+    if payload is None:
+        comtrade_rate_limiter.acquire()
+        
+        # Build API URL
+        url = f"https://comtrade.un.org/api/get?r={reporter}&p={partner}&ps={ps}&freq=M&px=HS&rg=all&fmt=json"
+        
+        print(f"Fetching data for {reporter}-{partner} for {ps}...")
+        
+        response = get_session().get(url, timeout=(3.05, 30))
+        response.raise_for_status()
+        
+        # Parse before caching so only readable responses are kept
+        body = response.content
+        payload = orjson.loads(body)
+        
+        # Cache the raw response body as received, no need to re-serialize it. Write it to a
+        # temporary file first so an interrupted write never leaves a truncated cache entry.
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    
+    # Convert to a DataFrame right away so the parsed records can be freed,
+    # using the known Comtrade columns in a fixed order
+    records = payload.get('dataset') or []
+    return pd.DataFrame.from_records(records, columns=COMTRADE_COLUMNS)
+
 def fetch_comtrade_data(reporter, partner, start_year, end_year):
     """
     Fetch trade data from UN Comtrade API
@@ -51,40 +216,82 @@ def fetch_comtrade_data(reporter, partner, start_year, end_year):
     Returns:
     DataFrame: Trade data
     """
-    all_data = []
+    # Request the years in batches to cut down on round trips and rate-limit sleeps
+    years = list(range(start_year, end_year + 1))
+    chunks = [tuple(years[i:i + COMTRADE_MAX_YEARS_PER_REQUEST])
+              for i in range(0, len(years), COMTRADE_MAX_YEARS_PER_REQUEST)]
     
-    for year in range(start_year, end_year + 1):
-        # UN Comtrade API has request limits, so we need to sleep between requests
-        time.sleep(1)
-        
-        # Build API URL
-        url = f"https://comtrade.un.org/api/get?r={reporter}&p={partner}&ps={year}&freq=M&px=HS&rg=all&fmt=json"
-        
-        print(f"Fetching data for {reporter}-{partner} for {year}...")
+    # The batches are independent, so fetch them concurrently and keep the results in year order
+    results = {}
+    with ThreadPoolExecutor(max_workers=COMTRADE_MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch_comtrade_years, reporter, partner, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                print(f"Exception occurred: {e}")
+    
+    frames = []
+    for chunk in chunks:
+        frame = results.get(chunk)
+        if frame is None:
+            continue
         
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                
-                # Check if we got valid data
-                if 'dataset' in data and data['dataset']:
-                    all_data.extend(data['dataset'])
-                else:
-                    print(f"No data returned for {year}")
-            else:
-                print(f"Error fetching data: {response.status_code}")
-                
-        except Exception as e:
-            print(f"Exception occurred: {e}")
+        # Check if we got valid data
+        if not frame.empty:
+            frames.append(frame)
+        else:
+            print(f"No data returned for {chunk[0]}-{chunk[-1]}")
             
-    # Convert to DataFrame
-    if all_data:
-        df = pd.DataFrame(all_data)
+    # Combine the per-batch frames once
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
         return df
     else:
         return pd.DataFrame()
 
+def init_pair_worker(rate, slots):
+    """
+    Give each worker process its share of the Comtrade rate limit
+    
+    Buckets start empty and staggered by worker slot, so the workers take turns
+    from the first request on instead of all firing at once.
+    """
+    with slots.get_lock():
+        slot = slots.value
+        slots.value += 1
+    
+    comtrade_rate_limiter.rate = rate
+    # Worker k gets its first token after (k + 1) intervals of the overall limit
+    comtrade_rate_limiter.tokens = 1 - (slot + 1) * rate / COMTRADE_REQUESTS_PER_SECOND
+    comtrade_rate_limiter.last = time.monotonic()
+
+@lru_cache(maxsize=1)
+def get_process_pool():
+    """Persistent worker pool for fetching country pairs in parallel, shut down at exit"""
+    pool = ProcessPoolExecutor(max_workers=COMTRADE_PAIR_WORKERS, initializer=init_pair_worker,
+                               initargs=(COMTRADE_REQUESTS_PER_SECOND / COMTRADE_PAIR_WORKERS,
+                                         multiprocessing.Value('i', 0)))
+    atexit.register(pool.shutdown)
+    return pool
+
+def fetch_comtrade_pairs(pairs, start_year, end_year):
+    """
+    Fetch trade data for several reporter/partner pairs in parallel worker processes
+    
+    Parameters:
+    pairs (list): (reporter, partner) country code tuples
+    start_year (int): Start year for data
+    end_year (int): End year for data
+    
+    Returns:
+    list: Trade data DataFrames, in the same order as pairs
+    """
+    pool = get_process_pool()
+    futures = [pool.submit(fetch_comtrade_data, reporter, partner, start_year, end_year)
+               for reporter, partner in pairs]
+    return [future.result() for future in futures]
+
 def fetch_wits_data(reporter, partner, start_year, end_year):
     """
     Alternative data source: World Bank WITS API
@@ -114,107 +321,96 @@ def create_sample_data():
     # Create date range from 2016 to 2025
     dates = pd.date_range(start=PRE_TARIFF_START, end=MOST_RECENT_DATA_CONTEXT_2025, freq='ME')
     
-    # Base values (millions USD) for different trade flows
-    colombia_us_exports_base = 1200
-    colombia_us_imports_base = 1500
-    colombia_china_exports_base = 500
-    colombia_china_imports_base = 1000
+    # Base values (millions USD) and long-run growth for each trade flow, in
+    # column order: Colombia->US exports, US->Colombia imports,
+    # Colombia->China exports, China->Colombia imports
+    bases = np.array([1200.0, 1500.0, 500.0, 1000.0])
+    trend_coefs = np.array([0.2, 0.15, 0.3, 0.4])
     
-    # Create random variations with trends reflecting tariff impacts
-    np.random.seed(42)  # For reproducibility
+    # Per-period multiplier as (offset, spread) for each trade flow; the
+    # multiplier is offset + spread * U(0, 1)
+    coef_table = np.array([
+        # pre-tariff: baseline
+        [(1.0, 0.0), (1.0, 0.0), (1.0, 0.0), (1.0, 0.0)],
+        # during-tariff: US trade dips, trade diverted to China
+        [(0.9, 0.1), (0.92, 0.08), (1.15, 0.1), (1.2, 0.1)],
+        # post-tariff: baseline
+        [(1.0, 0.0), (1.0, 0.0), (1.0, 0.0), (1.0, 0.0)],
+        # new-2025-tariff: steeper US decline from the 10% universal tariff
+        # (with reciprocal measures) and even stronger diversion to China
+        [(0.85, 0.05), (0.88, 0.07), (1.25, 0.15), (1.3, 0.12)],
+        # post-new-2025-tariff: recovery after the US-China agreement
+        [(1.03, 0.02), (1.02, 0.03), (0.97, 0.05), (0.95, 0.08)],
+    ])
     
-    # Generate time series with specific patterns for each period
-    data = pd.DataFrame({'date': dates})
-    data['period'] = 'pre-tariff'
-    data.loc[data['date'] >= TARIFF_START, 'period'] = 'during-tariff'
-    data.loc[data['date'] >= TARIFF_END, 'period'] = 'post-tariff'
-    data.loc[data['date'] >= NEW_2025_TARIFF_START_APPROX, 'period'] = 'new-2025-tariff'
-    data.loc[data['date'] >= NEW_2025_TARIFF_END_ONGOING, 'period'] = 'post-new-2025-tariff'
-    
-    # Create time factor for trends
-    data['time_factor'] = np.arange(len(data)) / len(data)
-    
-    # Colombia to US exports (affected by US tariffs)
-    data['colombia_us_exports'] = colombia_us_exports_base * (1 + 0.2 * data['time_factor'])
-    
-    # Add patterns for each period
-    mask_trump = data['period'] == 'during-tariff'
-    data.loc[mask_trump, 'colombia_us_exports'] *= 0.9 + 0.1 * np.random.random(mask_trump.sum())
-    
-    # For 2025 tariffs, create a steeper decline reflecting the 10% universal tariff
-    mask_2025 = data['period'] == 'new-2025-tariff'
-    if mask_2025.sum() > 0:
-        data.loc[mask_2025, 'colombia_us_exports'] *= 0.85 + 0.05 * np.random.random(mask_2025.sum())
-    
-    # Recovery pattern after China agreement
-    mask_post_2025 = data['period'] == 'post-new-2025-tariff'
-    if mask_post_2025.sum() > 0:
-        data.loc[mask_post_2025, 'colombia_us_exports'] *= 1.03 + 0.02 * np.random.random(mask_post_2025.sum())
-    
-    # US to Colombia imports (affected by retaliatory tariffs)
-    data['colombia_us_imports'] = colombia_us_imports_base * (1 + 0.15 * data['time_factor'])
-    
-    # Trump tariff period
-    data.loc[mask_trump, 'colombia_us_imports'] *= 0.92 + 0.08 * np.random.random(mask_trump.sum())
-    
-    # 2025 tariff period - assume Colombia also implemented reciprocal measures
-    if mask_2025.sum() > 0:
-        data.loc[mask_2025, 'colombia_us_imports'] *= 0.88 + 0.07 * np.random.random(mask_2025.sum())
-    
-    if mask_post_2025.sum() > 0:
-        data.loc[mask_post_2025, 'colombia_us_imports'] *= 1.02 + 0.03 * np.random.random(mask_post_2025.sum())
-    
-    # Colombia to China exports (possibly increased as trade diverted from US)
-    data['colombia_china_exports'] = colombia_china_exports_base * (1 + 0.3 * data['time_factor'])
-    
-    # Increase during tariff period as trade diverted from US - Trump era
-    data.loc[mask_trump, 'colombia_china_exports'] *= 1.15 + 0.1 * np.random.random(mask_trump.sum())
-    
-    # During 2025 tariffs, assume even stronger diversion to China
-    if mask_2025.sum() > 0:
-        data.loc[mask_2025, 'colombia_china_exports'] *= 1.25 + 0.15 * np.random.random(mask_2025.sum())
-    
-    # Slight decrease during temporary US-China agreement
-    if mask_post_2025.sum() > 0:
-        data.loc[mask_post_2025, 'colombia_china_exports'] *= 0.97 + 0.05 * np.random.random(mask_post_2025.sum())
+    # Create random variations with trends reflecting tariff impacts
+    rng = np.random.default_rng(42)  # For reproducibility
     
-    # China to Colombia imports (possibly increased as alternative to US goods)
-    data['colombia_china_imports'] = colombia_china_imports_base * (1 + 0.4 * data['time_factor'])
+    # Each date falls in the period of the last boundary it has reached
+    codes = (np.searchsorted(PERIOD_BOUNDARIES, dates.values, side='right') - 1).astype(np.int8)
     
-    # Increase during Trump tariff period
-    data.loc[mask_trump, 'colombia_china_imports'] *= 1.2 + 0.1 * np.random.random(mask_trump.sum())
+    # Time factor for trends; only used here, so it is not stored in the output
+    n = len(dates)
+    time_factor = np.arange(n, dtype=np.float64) / n
     
-    # Sharper increase during 2025 universal tariff
-    if mask_2025.sum() > 0:
-        data.loc[mask_2025, 'colombia_china_imports'] *= 1.3 + 0.12 * np.random.random(mask_2025.sum())
+    # Trend, period effect and random noise for all four series as one (N, 4) matrix
+    period_noise, final_noise = rng.random((2, n, 4))
+    vals = bases * (1 + trend_coefs * time_factor[:, None])
+    vals *= coef_table[codes, :, 0] + coef_table[codes, :, 1] * period_noise
+    vals *= 0.95 + 0.1 * final_noise
     
-    # Adjustment during US-China agreement period
-    if mask_post_2025.sum() > 0:
-        data.loc[mask_post_2025, 'colombia_china_imports'] *= 0.95 + 0.08 * np.random.random(mask_post_2025.sum())
+    # Build the frame in one go so every column is allocated once
+    return pd.DataFrame({
+        'date': dates,
+        # int8 codes into the fixed, chronologically ordered period categories
+        'period': pd.Categorical.from_codes(codes, categories=PERIODS, ordered=True),
+        'colombia_us_exports': vals[:, 0],
+        'colombia_us_imports': vals[:, 1],
+        'colombia_china_exports': vals[:, 2],
+        'colombia_china_imports': vals[:, 3],
+    })
+
+def save_trade_data(trade_data, file_format='parquet'):
+    """
+    Save trade data to the data directory
     
-    # Add random noise to all series
-    for col in ['colombia_us_exports', 'colombia_us_imports', 'colombia_china_exports', 'colombia_china_imports']:
-        data[col] *= 0.95 + 0.1 * np.random.random(len(data))
+    Parameters:
+    trade_data (DataFrame): Trade data to save
+    file_format (str): 'parquet' (default) or 'csv'
     
-    return data
+    Returns:
+    str: Path of the written file
+    """
+    if file_format == 'csv':
+        path = os.path.join(DATA_DIR, 'trade_data.csv')
+        trade_data.to_csv(path, index=False)
+    else:
+        # Parquet keeps the datetime and categorical dtypes and needs no re-parsing
+        path = os.path.join(DATA_DIR, 'trade_data.parquet')
+        trade_data.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+    return path
 
-def main():
+def main(argv=None):
     """Main function to fetch and save trade data"""
+    parser = argparse.ArgumentParser(description="Fetch Colombia-US and Colombia-China trade data")
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet',
+                        help="Output file format (default: parquet)")
+    args = parser.parse_args(argv)
+    
     print("Fetching trade data for Colombia-US and Colombia-China...")
     
     # Try to fetch real data
     try:
         # Country codes for UN Comtrade: Colombia=170, USA=842, China=156
-        # colombia_us_data = fetch_comtrade_data('170', '842', 2016, 2023)
-        # colombia_china_data = fetch_comtrade_data('170', '156', 2016, 2023)
+        # colombia_us_data, colombia_china_data = fetch_comtrade_pairs([('170', '842'), ('170', '156')], 2016, 2023)
         
         # If real data fetching fails or for testing purposes, use sample data
         print("Using sample data...")
         trade_data = create_sample_data()
         
         # Save the data
-        trade_data.to_csv(os.path.join(DATA_DIR, 'trade_data.csv'), index=False)
-        print(f"Data saved to {os.path.join(DATA_DIR, 'trade_data.csv')}")
+        path = save_trade_data(trade_data, args.format)
+        print(f"Data saved to {path}")
         
         return 0
     